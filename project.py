@@ -3,10 +3,21 @@
 """
 
 import csv
+import html
 import os
 import re
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import itemgetter, truediv
 from tabulate import tabulate
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+
+READ_BUFFER_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 1 << 16
+SEARCH_CACHE_SIZE = 128
 
 
 def display_results(results: List[List], headers: List[str]) -> None:
@@ -20,14 +31,59 @@ def display_results(results: List[List], headers: List[str]) -> None:
     Возвращает:
     None
     """
-    numbered_results = [[i + 1] + result for i, result in enumerate(results)]
-    print(tabulate(numbered_results, headers=headers, tablefmt='grid'))
+    print(tabulate(results, headers=headers, tablefmt='grid', showindex=range(1, len(results) + 1)))
+
+
+def _html_cell(tag: str, text: str, numeric: bool) -> str:
+    """
+    Формирует ячейку HTML таблицы, выравнивая числа по правому краю, как tabulate.
+
+    Параметры:
+    tag (str): Тег ячейки ('td' или 'th').
+    text (str): Текст ячейки.
+    numeric (bool): Признак числового столбца.
+
+    Возвращает:
+    str: HTML разметка ячейки.
+    """
+    if numeric:
+        return f'<{tag} style="text-align: right;">{html.escape(text)}</{tag}>'
+    return f'<{tag}>{html.escape(text)}</{tag}>'
+
+
+def iter_html_table(results: List[List], headers: List[str]) -> Iterator[str]:
+    """
+    Построчно формирует HTML таблицу с результатами поиска.
+
+    Числа форматируются так же, как в tabulate (формат 'g'), поэтому
+    таблица совпадает с выводом в консоль. Числовые столбцы определяются
+    по первой строке результатов.
+
+    Параметры:
+    results (list): Список результатов поиска.
+    headers (list): Заголовки таблицы.
+
+    Возвращает:
+    Iterator[str]: Фрагменты HTML разметки таблицы.
+    """
+    first = results[0] if results else []
+    numeric = [True] + [isinstance(value, (int, float)) for value in first]
+    numeric += [False] * (len(headers) - len(numeric))
+    yield '<table>\n<thead>\n'
+    yield '<tr>' + ''.join(map(_html_cell, repeat('th'), headers, numeric)) + '</tr>\n'
+    yield '</thead>\n<tbody>\n'
+    for i, result in enumerate(results, 1):
+        cells = [format(value, 'g') if isinstance(value, float) else str(value) for value in (i, *result)]
+        yield '<tr>' + ''.join(map(_html_cell, repeat('td'), cells, numeric)) + '</tr>\n'
+    yield '</tbody>\n</table>'
 
 
 def export_to_html(results: List[List], headers: List[str], filename: str) -> None:
     """
     Экспортирует результаты поиска в HTML файл.
 
+    Таблица записывается по строкам, без построения всего документа в памяти.
+
     Параметры:
     results (list): Список результатов поиска.
     headers (list): Заголовки таблицы.
@@ -36,10 +92,25 @@ def export_to_html(results: List[List], headers: List[str], filename: str) -> No
     Возвращает:
     None
     """
-    numbered_results = [[i + 1] + result for i, result in enumerate(results)]
-    table = tabulate(numbered_results, headers=headers, tablefmt='html')
-    with open(filename, 'w', encoding='utf-8') as file:
-        file.write(table)
+    with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+        file.writelines(iter_html_table(results, headers))
+
+
+def filter_by_substring(names: List[str], needle: str) -> List[int]:
+    """
+    Находит индексы строк, содержащих подстроку.
+
+    Проверка выполняется через map/compress, поэтому цикл по строкам
+    целиком проходит на уровне C без интерпретации байт-кода.
+
+    Параметры:
+    names (list): Список строк для поиска.
+    needle (str): Искомая подстрока.
+
+    Возвращает:
+    list: Индексы подходящих строк в порядке возрастания.
+    """
+    return list(compress(range(len(names)), map(str.__contains__, names, repeat(needle))))
 
 
 class PriceMachine:
@@ -49,76 +120,152 @@ class PriceMachine:
 
     HEADERS = ['№', 'Наименование', 'цена', 'вес', 'цена за кг.', 'файл']
 
+    NAME_KWS = ('название', 'продукт', 'товар', 'наименование')
+    PRICE_KWS = ('цена', 'розница')
+    WEIGHT_KWS = ('фасовка', 'масса', 'вес')
+
     def __init__(self) -> None:
         """
         Инициализация объекта PriceMachine.
+
+        Данные хранятся по столбцам: названия - списком строк, цены, веса
+        и цены за кг - массивами чисел с плавающей точкой. Имена файлов
+        хранятся один раз в files, а для строк - только их индексы в file_idx.
+        """
+        # Кэш результатов search_items по тексту запроса. Он действителен, пока
+        # не меняются загруженные данные: любой код, изменяющий столбцы,
+        # должен проходить через _clear_data, который очищает кэш.
+        # Кэш ссылается на self через связанный метод; этот цикл ссылок
+        # освобождается сборщиком мусора вместе с объектом.
+        self._cached_search = lru_cache(maxsize=SEARCH_CACHE_SIZE)(self.search_items)
+        self._clear_data()
+
+    def _clear_data(self) -> None:
+        """
+        Сбрасывает загруженные данные.
+
+        Возвращает:
+        None
         """
-        self.data = []
+        self.names = []
+        self.prices = array('d')
+        self.weights = array('d')
+        self.ppk = array('d')
+        self.files = []
+        self.file_idx = array('i')
+        self._names_cf = []
+        self._cached_search.cache_clear()
 
     def load_prices(self, directory: str) -> None:
         """
         Загружает ценовые данные из указанной директории.
 
+        Файлы читаются параллельно в пуле потоков, каждый в собственные
+        локальные столбцы, которые затем добавляются к общим одним extend
+        на файл в порядке обхода директории.
+
         Параметры:
         directory (str): Путь к директории с файлами ценовых данных.
         """
-        self.data = []
-        for filename in os.listdir(directory):
-            if filename.endswith('.csv') and 'price' in filename.lower():
-                self._load_file(os.path.join(directory, filename))
-
-    def _load_file(self, filepath: str) -> None:
+        self._clear_data()
+        paths = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.csv') and 'price' in name.lower() and entry.is_file():
+                    paths.append(entry.path)
+        if not paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            loaded = list(executor.map(self._load_file, paths))
+        for file_no, (filepath, (names, prices, weights, ppk)) in enumerate(zip(paths, loaded)):
+            self.files.append(sys.intern(os.path.basename(filepath)))
+            self.file_idx.extend(repeat(file_no, len(names)))
+            self.names.extend(names)
+            self.prices.extend(prices)
+            self.weights.extend(weights)
+            self.ppk.extend(ppk)
+            self._names_cf.extend(map(str.casefold, names))
+
+    def _load_file(self, filepath: str) -> Tuple[List[str], array, array, array]:
         """
         Загружает данные из файла CSV.
 
+        Столбцы с названием, ценой и весом определяются один раз по заголовку,
+        после чего строки читаются по индексам без повторного сопоставления.
+        Строки с отсутствующими, пустыми или состоящими из пробелов значениями
+        пропускаются.
+        Метод не изменяет состояние объекта и может вызываться из разных потоков.
+
         Параметры:
         filepath (str): Путь к файлу CSV.
 
         Возвращает:
-        None
+        tuple: Названия, цены, веса и цены за кг из файла.
         """
+        names = []
+        prices = array('d')
+        weights = array('d')
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    self._process_row(filepath, row)
+            with open(filepath, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE, newline='') as file:
+                reader = csv.reader(file)
+                header = next(reader, [])
+                name_idx, price_idx, weight_idx = self._find_columns(header)
+                if -1 in (name_idx, price_idx, weight_idx):
+                    print(f"Ошибка при чтении файла {filepath}: не найдены необходимые столбцы")
+                    return names, prices, weights, array('d')
+                pick = itemgetter(name_idx, price_idx, weight_idx)
+                min_len = max(name_idx, price_idx, weight_idx) + 1
+                for row in filter(None, reader):
+                    if len(row) < min_len:
+                        continue
+                    name_cell, price_cell, weight_cell = pick(row)
+                    name_cell = name_cell.strip()
+                    if (not name_cell or not price_cell or price_cell.isspace()
+                            or not weight_cell or weight_cell.isspace()):
+                        continue
+                    if ',' in price_cell:
+                        price_cell = price_cell.replace(',', '.')
+                    if ',' in weight_cell:
+                        weight_cell = weight_cell.replace(',', '.')
+                    try:
+                        price = float(price_cell)
+                        weight = float(weight_cell)
+                    except ValueError as e:
+                        print(f"Ошибка при обработке строки {row}: {e}")
+                        continue
+                    names.append(name_cell)
+                    prices.append(price)
+                    weights.append(weight)
         except (IOError, csv.Error) as e:
             print(f"Ошибка при чтении файла {filepath}: {e}")
+        ppk = array('d', map(round, map(truediv, prices, weights), repeat(2)))
+        return names, prices, weights, ppk
 
-    def _process_row(self, filename: str, row: dict) -> None:
-        """
-        Обрабатывает строку из CSV файла и добавляет ее в данные.
-
-        Параметры:
-        filename (str): Имя файла.
-        row (dict): Строка из CSV файла.
-
-        Возвращает:
-        None
+    def _find_columns(self, header: List[str]) -> Tuple[int, int, int]:
         """
-        try:
-            product_name = self._extract_value(row, r'(название|продукт|товар|наименование)')
-            price = float(self._extract_value(row, r'(цена|розница)').replace(',', '.'))
-            weight = float(self._extract_value(row, r'(фасовка|масса|вес)').replace(',', '.'))
-            self.data.append([filename, product_name, price, weight, round(price / weight, 2)])
-        except (TypeError, ValueError) as e:
-            print(f"Ошибка при обработке строки {row}: {e}")
+        Находит индексы столбцов с названием, ценой и весом.
 
-    def _extract_value(self, row: dict, pattern: str) -> str:
-        """
-        Извлекает значение из строки на основе регулярного выражения.
+        Столбец определяется по вхождению ключевого слова в его название
+        без учета регистра.
 
         Параметры:
-        row (dict): Строка из CSV файла.
-        pattern (str): Регулярное выражение для поиска значения.
+        header (list): Заголовок CSV файла.
 
         Возвращает:
-        str: Найденное значение.
+        tuple: Индексы первых подходящих столбцов названия, цены и веса
+        (-1, если столбец не найден).
         """
-        for column_name, value in row.items():
-            if re.search(pattern, column_name, re.IGNORECASE):
-                return value.strip()
-        return ""
+        name_idx = price_idx = weight_idx = -1
+        for i, column_name in enumerate(header):
+            low = column_name.casefold()
+            if name_idx == -1 and any(kw in low for kw in self.NAME_KWS):
+                name_idx = i
+            if price_idx == -1 and any(kw in low for kw in self.PRICE_KWS):
+                price_idx = i
+            if weight_idx == -1 and any(kw in low for kw in self.WEIGHT_KWS):
+                weight_idx = i
+        return name_idx, price_idx, weight_idx
 
     def search_items(self, query: str) -> List[List]:
         """
@@ -128,10 +275,19 @@ class PriceMachine:
         query (str): Строка для поиска.
 
         Возвращает:
-        list: Список найденных элементов.
+        list: Список найденных элементов, отсортированный по цене за кг.
+        Столбцы строк соответствуют HEADERS (без номера).
         """
-        results = [row for row in self.data if re.search(query, row[1], re.IGNORECASE)]
-        return sorted(results, key=lambda x: x[4])
+        if re.escape(query) == query:
+            indices = filter_by_substring(self._names_cf, query.casefold())
+        else:
+            pattern = re.compile(query, re.IGNORECASE)
+            indices = list(compress(range(len(self.names)), map(pattern.search, self.names)))
+        ppk = self.ppk
+        indices.sort(key=ppk.__getitem__)
+        names, prices, weights = self.names, self.prices, self.weights
+        files, file_idx = self.files, self.file_idx
+        return [[names[i], prices[i], weights[i], ppk[i], files[file_idx[i]]] for i in indices]
 
     def find_text(self, query: str) -> None:
         """
@@ -143,7 +299,7 @@ class PriceMachine:
         Возвращает:
         None
         """
-        results = self.search_items(query)
+        results = self._cached_search(query)
         display_results(results, self.HEADERS)
         html_filename = 'search_results.html'
         export_to_html(results, self.HEADERS, html_filename)